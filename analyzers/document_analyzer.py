@@ -21,37 +21,92 @@ Handles document profiling and type detection
 """
 
 import re
-from collections import defaultdict
+from collections import defaultdict, Counter
 from typing import Dict, Any
 
+# Optional Aho-Corasick automaton for single-pass indicator scanning
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Pre-compiled numbered-sections pattern (shared across all analyzer calls
+# in batch processing, avoiding the per-document regex cache lookup)
+_NUMBERED_SECTIONS_RE = re.compile(r'\b\d+\.\d+\s+[A-Z]')
+
 class DocumentAnalyzer:
     """Analyzes PDF documents to determine type and characteristics"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        
+        # Flatten every document type's indicator list once so detection is
+        # one scan over the text instead of one pass per document type
+        indicator_labels = defaultdict(list)
+        for doc_type, type_config in config['document_types'].items():
+            for indicator in type_config.get('indicators', []):
+                indicator_labels[indicator].append(doc_type)
+        self._indicator_labels = dict(indicator_labels)
+        
+        self._indicator_automaton = None
+        if ahocorasick is not None and self._indicator_labels:
+            automaton = ahocorasick.Automaton()
+            for indicator, labels in self._indicator_labels.items():
+                automaton.add_word(indicator, (indicator, tuple(labels)))
+            automaton.make_automaton()
+            self._indicator_automaton = automaton
     
-    def analyze_document(self, doc) -> Dict[str, Any]:
+    def _count_type_indicators(self, text_lower: str) -> Counter:
+        """Count distinct per-type indicators present in the text"""
+        counts = Counter()
+        
+        if self._indicator_automaton is not None:
+            # Single linear pass over the text for all indicator sets
+            found = {value for _, value in self._indicator_automaton.iter(text_lower)}
+            for _, labels in found:
+                counts.update(labels)
+        else:
+            for indicator, labels in self._indicator_labels.items():
+                if indicator in text_lower:
+                    counts.update(labels)
+        
+        return counts
+    
+    def analyze_document(self, doc, page_dicts=None) -> Dict[str, Any]:
         """Analyze document structure and content to create a profile"""
         structure_indicators = {}
         total_text = ""
         font_stats = defaultdict(int)
+        # First-page lines in raw span order, recorded for the title
+        # extractor so it does not walk the same spans again
+        first_page_lines = []
         
         # Quick scan of first few pages for analysis
         for page_num in range(min(3, len(doc))):
-            page = doc[page_num]
             page_text = ""
             
-            # Extract text and font information
-            blocks = page.get_text("dict")["blocks"]
+            # Extract text and font information (reusing the shared page
+            # dicts when the caller already parsed them)
+            if page_dicts is not None:
+                blocks = page_dicts[page_num]["blocks"]
+            else:
+                blocks = doc[page_num].get_text("dict")["blocks"]
             for block in blocks:
                 if "lines" in block:
                     for line in block["lines"]:
+                        if page_num == 0:
+                            raw_line = ''.join(
+                                span["text"] for span in line["spans"]).strip()
+                            if raw_line:
+                                first_page_lines.append(raw_line)
                         line_text = ""
                         for span in line["spans"]:
                             text = span["text"].strip()
                             if text:
                                 line_text += text + " "
-                                font_key = f"{span['font']}_{span['size']:.1f}"
+                                # Tuple keys hash at C level without the
+                                # per-span f-string allocation
+                                font_key = (span['font'], round(span['size'], 1))
                                 font_stats[font_key] += len(text)
                         
                         if line_text.strip():
@@ -59,34 +114,26 @@ class DocumentAnalyzer:
             
             total_text += page_text
         
-        # Document type detection
+        # Document type detection: all indicator sets are counted in a
+        # single pass over the lowered text
         text_lower = total_text.lower()
+        indicator_counts = self._count_type_indicators(text_lower)
         
-        # Form detection
-        form_config = self.config['document_types']['form']
-        form_indicators = form_config['indicators']
-        structure_indicators['is_form'] = sum(1 for indicator in form_indicators 
-                                            if indicator in text_lower) >= form_config['min_indicators']
-        
-        # Academic detection
-        academic_config = self.config['document_types']['academic']
-        academic_indicators = academic_config['indicators']
-        structure_indicators['is_academic'] = sum(1 for indicator in academic_indicators 
-                                                if indicator in text_lower) >= academic_config['min_indicators']
-        
-        # Technical document detection
-        tech_config = self.config['document_types']['technical']
-        tech_indicators = tech_config['indicators']
-        structure_indicators['is_technical'] = sum(1 for indicator in tech_indicators 
-                                                 if indicator in text_lower) >= tech_config['min_indicators']
+        doc_types = self.config['document_types']
+        structure_indicators['is_form'] = (
+            indicator_counts['form'] >= doc_types['form']['min_indicators'])
+        structure_indicators['is_academic'] = (
+            indicator_counts['academic'] >= doc_types['academic']['min_indicators'])
+        structure_indicators['is_technical'] = (
+            indicator_counts['technical'] >= doc_types['technical']['min_indicators'])
         
-        # TOC detection
-        structure_indicators['has_toc'] = any(phrase in text_lower for phrase in 
-                                            ['table of contents', 'contents'])
+        # TOC detection ('table of contents' always contains 'contents',
+        # so a single substring test covers both phrases)
+        structure_indicators['has_toc'] = 'contents' in text_lower
         
         # Numbered sections detection
         structure_indicators['has_numbered_sections'] = bool(
-            re.search(r'\b\d+\.\d+\s+[A-Z]', total_text)
+            _NUMBERED_SECTIONS_RE.search(total_text)
         )
         
         structure_indicators['avg_text_per_page'] = len(total_text) / max(1, min(3, len(doc)))
@@ -94,6 +141,7 @@ class DocumentAnalyzer:
         
         return {
             'text_sample': total_text[:1000],
+            'first_page_lines': first_page_lines,
             'font_stats': dict(font_stats),
             'structure': structure_indicators,
             'page_count': len(doc)
@@ -5,11 +5,139 @@ Simple way to process PDFs from command line
 """
 
 import argparse
+import atexit
+import functools
 import sys
 import os
-import json
 from pathlib import Path
 
+from config.layoutlmv3_configs import CONFIG_NAMES
+from io_handlers.batch_writer import iter_json_chunks
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Per-process worker state, populated once by _init_worker so each worker
+# loads the extractor (and any LayoutLMv3 weights) a single time instead
+# of once per file
+_worker_extractor = None
+_worker_flags = None
+_worker_writer = None
+
+@functools.lru_cache(maxsize=8)
+def _get_extractor(use_case, enable_accuracy, enable_performance):
+    """Build (or reuse) a warm extractor for a config preset"""
+    # Import lazily so the model is constructed after the fork/spawn,
+    # never inherited from the parent process. The cache keeps the model
+    # resident across repeated initializations in long-lived processes.
+    from pdf_extractor_modular import ModularPDFExtractor
+    from config.layoutlmv3_configs import get_config_for_use_case
+
+    return ModularPDFExtractor(
+        config=get_config_for_use_case(use_case),
+        enable_accuracy_enhancement=enable_accuracy,
+        enable_performance_monitoring=enable_performance
+    )
+
+def _report_write_failures():
+    """Drain the worker's writer and report writes that failed
+
+    Submitted payloads are written asynchronously, so per-file write
+    errors only surface here; each error is reported once.
+    """
+    writer = _worker_writer
+    if writer is None:
+        return 0
+    writer.drain()
+    errors, writer.errors = writer.errors, []
+    for path, error in errors:
+        print(f"❌ Write failed: {path}: {error}")
+    return len(errors)
+
+def _init_worker(use_case, flags):
+    """Set up one extractor and writer per worker process"""
+    global _worker_extractor, _worker_flags, _worker_writer
+    from io_handlers.batch_writer import BatchResultWriter
+
+    _worker_flags = flags
+    _worker_writer = BatchResultWriter()
+    # This hook only fires for in-process (thread-mode) runs: fork-started
+    # pool workers exit via os._exit and never run atexit, which is why
+    # process-mode tasks flush the writer before reporting success
+    atexit.register(_report_write_failures)
+    _worker_extractor = _get_extractor(use_case, flags['accuracy'], flags['performance'])
+
+    if flags['verbose']:
+        print(f"🚀 Extractor initialized (pid {os.getpid()})")
+        print(f"   LayoutLMv3: {'✅' if _worker_extractor.layoutlmv3_enhancer else '❌'}")
+        print(f"   Accuracy enhancer: {'✅' if _worker_extractor.accuracy_enhancer else '❌'}")
+        print(f"   Performance monitor: {'✅' if _worker_extractor.performance_monitor else '❌'}")
+
+def _process_one(pdf_file):
+    """Process a single PDF in a worker and return a small summary dict"""
+    flags = _worker_flags
+    verbose = flags['verbose']
+
+    # Per-file report lines are buffered and printed by the parent in one
+    # go, so parallel workers never interleave or contend on stdout
+    lines = []
+
+    try:
+        if verbose:
+            lines.append(f"📄 Processing: {pdf_file}")
+
+        # Extract structure
+        result = _worker_extractor.extract_structure(pdf_file)
+
+        # Generate output filename
+        base_name = Path(pdf_file).stem
+        output_file = os.path.join(flags['output_dir'], f"{base_name}.json")
+
+        # Save result via the background writer so this worker can move
+        # straight on to the next PDF; large outlines are streamed in
+        # chunks rather than serialized into one giant payload
+        _worker_writer.submit(output_file, iter_json_chunks(result))
+
+        if flags['durable_writes']:
+            # Process workers can die via os._exit with jobs still queued,
+            # so the payload must be on disk before this task reports
+            # success; each worker handles one file at a time here, so any
+            # error left after the flush belongs to this file
+            _worker_writer.flush()
+            errors, _worker_writer.errors = _worker_writer.errors, []
+            if errors:
+                for path, error in errors:
+                    lines.append(f"❌ Write failed: {path}: {error}")
+                return {'file': pdf_file, 'ok': False, 'report': '\n'.join(lines)}
+
+        # Show results
+        title = result.get('title', 'No title')
+        headings = len(result.get('outline', []))
+
+        if verbose:
+            lines.append(f"   ✅ Title: {title}")
+            lines.append(f"   📑 Headings: {headings}")
+            lines.append(f"   💾 Saved: {output_file}")
+
+            # Show performance metrics if available
+            if 'performance_metrics' in result:
+                perf = result['performance_metrics']
+                lines.append(f"   ⚡ Time: {perf.get('processing_time', 0):.3f}s")
+                lines.append(f"   💾 Memory: {perf.get('memory_usage', 0):.1f}MB")
+
+            # Show accuracy metrics if available
+            if 'accuracy_metrics' in result:
+                acc = result['accuracy_metrics']
+                lines.append(f"   🎯 F1-Score: {acc.get('f1_score', 0):.3f}")
+        else:
+            lines.append(f"✅ {pdf_file} → {output_file} (title: {title[:30]}{'...' if len(title) > 30 else ''}, {headings} headings)")
+
+        return {'file': pdf_file, 'ok': True, 'output': output_file,
+                'title': title, 'headings': headings,
+                'report': '\n'.join(lines)}
+
+    except Exception as e:
+        lines.append(f"❌ Error processing {pdf_file}: {e}")
+        return {'file': pdf_file, 'ok': False, 'report': '\n'.join(lines)}
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract structure from PDF documents",
@@ -32,105 +160,120 @@ Examples:
   python cli.py document.pdf --verbose
         """
     )
-    
+
     parser.add_argument('files', nargs='+', help='PDF file(s) to process')
-    parser.add_argument('-o', '--output', default='output', 
+    parser.add_argument('-o', '--output', default='output',
                        help='Output directory (default: output)')
-    parser.add_argument('-c', '--config', 
-                       choices=['balanced', 'high_accuracy', 'fast', 'cpu_only', 'multilingual', 'academic'],
+    parser.add_argument('-c', '--config',
+                       choices=CONFIG_NAMES,
                        default='balanced',
                        help='Configuration preset (default: balanced)')
+    parser.add_argument('-w', '--workers', type=int,
+                       default=min(os.cpu_count() or 1, 6),
+                       help='Parallel workers (default: up to 6)')
+    parser.add_argument('--executor', choices=['auto', 'thread', 'process'],
+                       default='auto',
+                       help='Executor type (auto: threads for light configs)')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Show detailed output')
     parser.add_argument('--no-accuracy', action='store_true',
                        help='Disable accuracy enhancement')
     parser.add_argument('--no-performance', action='store_true',
                        help='Disable performance monitoring')
-    
+
     args = parser.parse_args()
-    
+
     try:
-        # Import and setup
-        from pdf_extractor_modular import ModularPDFExtractor
-        from config.layoutlmv3_configs import get_config_for_use_case
-        
-        # Get configuration
-        config = get_config_for_use_case(args.config)
         if args.verbose:
             print(f"📋 Using configuration: {args.config}")
-        
-        # Initialize extractor
-        extractor = ModularPDFExtractor(
-            config=config,
-            enable_accuracy_enhancement=not args.no_accuracy,
-            enable_performance_monitoring=not args.no_performance
-        )
-        
-        if args.verbose:
-            print(f"🚀 Extractor initialized")
-            print(f"   LayoutLMv3: {'✅' if extractor.layoutlmv3_enhancer else '❌'}")
-            print(f"   Accuracy enhancer: {'✅' if extractor.accuracy_enhancer else '❌'}")
-            print(f"   Performance monitor: {'✅' if extractor.performance_monitor else '❌'}")
-        
+
         # Create output directory
         os.makedirs(args.output, exist_ok=True)
-        
-        # Process files
-        processed = 0
-        total_files = len(args.files)
-        
+
+        # Existence pre-check: one scandir per unique directory instead
+        # of a stat() syscall per file (batch globs can expand to
+        # thousands of names)
+        existing = []
+        names_by_dir = {}
         for pdf_file in args.files:
-            if not os.path.exists(pdf_file):
+            parent = os.path.dirname(pdf_file) or '.'
+            names = names_by_dir.get(parent)
+            if names is None:
+                try:
+                    with os.scandir(parent) as entries:
+                        names = {entry.name for entry in entries}
+                except OSError:
+                    names = set()
+                names_by_dir[parent] = names
+            if os.path.basename(pdf_file) in names:
+                existing.append(pdf_file)
+            else:
                 print(f"❌ File not found: {pdf_file}")
-                continue
-                
-            try:
-                if args.verbose:
-                    print(f"📄 Processing: {pdf_file}")
-                
-                # Extract structure
-                result = extractor.extract_structure(pdf_file)
-                
-                # Generate output filename
-                base_name = Path(pdf_file).stem
-                output_file = os.path.join(args.output, f"{base_name}.json")
-                
-                # Save result
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                processed += 1
-                
-                # Show results
-                title = result.get('title', 'No title')
-                headings = len(result.get('outline', []))
-                
-                if args.verbose:
-                    print(f"   ✅ Title: {title}")
-                    print(f"   📑 Headings: {headings}")
-                    print(f"   💾 Saved: {output_file}")
-                    
-                    # Show performance metrics if available
-                    if 'performance_metrics' in result:
-                        perf = result['performance_metrics']
-                        print(f"   ⚡ Time: {perf.get('processing_time', 0):.3f}s")
-                        print(f"   💾 Memory: {perf.get('memory_usage', 0):.1f}MB")
-                    
-                    # Show accuracy metrics if available
-                    if 'accuracy_metrics' in result:
-                        acc = result['accuracy_metrics']
-                        print(f"   🎯 F1-Score: {acc.get('f1_score', 0):.3f}")
-                else:
-                    print(f"✅ {pdf_file} → {output_file} (title: {title[:30]}{'...' if len(title) > 30 else ''}, {headings} headings)")
-                
-            except Exception as e:
-                print(f"❌ Error processing {pdf_file}: {e}")
-        
+
+        if not existing:
+            # Nothing to do: exit before any extractor (and its heavy
+            # model stack) would be imported by a worker
+            print(f"\n📊 Summary: 0/{len(args.files)} files processed successfully")
+            sys.exit(1)
+
+        # Process files in parallel (extraction is CPU-bound, so one
+        # worker process per file scales across cores)
+        processed = 0
+        total_files = len(args.files)
+        workers = max(1, min(args.workers, len(existing)))
+
+        # Light configs (no LayoutLMv3 inference, no accuracy pass) spend
+        # their time in PyMuPDF C calls that release the GIL, so threads
+        # give the speedup without duplicating model RAM per process
+        use_threads = (args.executor == 'thread' or
+                       (args.executor == 'auto' and
+                        (args.config in ('fast', 'cpu_only') or args.no_accuracy)))
+
+        flags = {
+            'output_dir': args.output,
+            'verbose': args.verbose,
+            'accuracy': not args.no_accuracy,
+            'performance': not args.no_performance,
+            # Thread-mode writes stay asynchronous (the parent drains the
+            # shared writer); process-mode writes must be flushed per task
+            # because fork workers exit without running atexit hooks
+            'durable_writes': not use_threads
+        }
+
+        if use_threads:
+            _init_worker(args.config, flags)  # one shared extractor for all threads
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_worker,
+                                           initargs=(args.config, flags))
+
+        reports = []
+        try:
+            with executor:
+                for summary in executor.map(_process_one, existing, chunksize=1):
+                    if summary['report']:
+                        reports.append(summary['report'])
+                    if summary['ok']:
+                        processed += 1
+        finally:
+            # Process workers drain their writers at exit; the shared
+            # thread-mode writer lives here and is drained in a finally so
+            # an interrupted run still flushes pending writes and reports
+            # the ones that failed, which are not counted as processed
+            if use_threads and _worker_writer is not None:
+                processed -= _report_write_failures()
+
+        # All per-file reports go out in one stdout call at the end, so
+        # the hot loop never touches the (possibly line-buffered) stream
+        if reports:
+            sys.stdout.write('\n'.join(reports) + '\n')
+
         # Summary
         print(f"\n📊 Summary: {processed}/{total_files} files processed successfully")
         if processed > 0:
             print(f"📁 Results saved in: {args.output}/")
-            
+
     except ImportError as e:
         print(f"❌ Import error: {e}")
         print("💡 Try: pip install -r requirements.txt")
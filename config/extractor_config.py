@@ -3,12 +3,44 @@ Complete working configuration for PDF extractor
 Includes all required keys to prevent errors
 """
 
+import copy
+import functools
+import json
+import re
+import types
+
+_NOISE_PATTERNS = [
+    r'^[\s\-_\.]+$',
+    r'^\d+$',
+    r'^[^\w\s]*$',
+    r'^(page|p\.)\s*\d+',
+    r'^\s*\d+\s*/\s*\d+\s*$'
+]
+
+@functools.lru_cache(maxsize=None)
+def compile_noise_patterns(patterns):
+    """Compile a noise-pattern tuple into one anchored alternation
+
+    Cached on the pattern tuple so every filter built from the same
+    config shares one compiled regex; kept out of the config dict itself
+    because config dicts are deep-copied on handout.
+    """
+    return re.compile(
+        '^(?:' + '|'.join('(?:%s)' % p for p in patterns) + ')',
+        re.IGNORECASE)
+
+def _thaw(value):
+    """Deep-convert read-only mapping views back into plain dicts"""
+    if isinstance(value, (dict, types.MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
 class ExtractorConfig:
     """Configuration management for PDF extraction components"""
     
     @staticmethod
-    def get_default_config():
-        """Get complete default configuration for the extractor"""
+    def _build_default_config():
+        """Build the full default configuration dict (runs once at import)"""
         return {
             'extraction': {
                 'min_confidence': 0.5,
@@ -69,48 +101,42 @@ class ExtractorConfig:
             },
             'document_types': {
                 'business': {
-                    'indicators': ['memo', 'report', 'proposal', 'minutes'],
+                    'indicators': frozenset({'memo', 'report', 'proposal', 'minutes'}),
                     'min_indicators': 1,
-                    'avoid_fields': ['name:', 'date:', 'signature:', 'employee']
+                    'avoid_fields': frozenset({'name:', 'date:', 'signature:', 'employee'})
                 },
                 'form': {
-                    'indicators': ['application', 'form', 'template', 'document', 'submission'],
+                    'indicators': frozenset({'application', 'form', 'template', 'document', 'submission'}),
                     'min_indicators': 1,
-                    'title_keywords': ['application', 'document', 'form', 'template', 'submission'],
-                    'avoid_keywords': ['microsoft', 'word', '.doc', 'file', '.pdf'],
-                    'avoid_fields': ['name:', 'date:', 'signature:', 'employee']
+                    'title_keywords': frozenset({'application', 'document', 'form', 'template', 'submission'}),
+                    'avoid_keywords': frozenset({'microsoft', 'word', '.doc', 'file', '.pdf'}),
+                    'avoid_fields': frozenset({'name:', 'date:', 'signature:', 'employee'})
                 },
                 'academic': {
-                    'indicators': ['syllabus', 'curriculum', 'course', 'university', 'college', 'academic'],
+                    'indicators': frozenset({'syllabus', 'curriculum', 'course', 'university', 'college', 'academic'}),
                     'min_indicators': 1,
                     'max_dots': 3
                 },
                 'technical': {
-                    'indicators': ['technical', 'specification', 'manual', 'guide', 'documentation'],
+                    'indicators': frozenset({'technical', 'specification', 'manual', 'guide', 'documentation'}),
                     'min_indicators': 1,
                     'max_parentheses': 3
                 },
                 'simple': {
                     'max_underscores': 2,
-                    'avoid_patterns': ['copyright', '©', 'all rights reserved']
+                    'avoid_patterns': frozenset({'copyright', '©', 'all rights reserved'})
                 }
             },
             'filtering': {
-                'noise_patterns': [
-                    r'^[\s\-_\.]+$',
-                    r'^\d+$',
-                    r'^[^\w\s]*$',
-                    r'^(page|p\.)\s*\d+',
-                    r'^\s*\d+\s*/\s*\d+\s*$'
-                ],
-                'avoid_general': [
+                'noise_patterns': tuple(_NOISE_PATTERNS),
+                'avoid_general': frozenset({
                     'copyright', 'all rights reserved', '©', 'confidential',
                     'draft', 'preliminary', 'internal use'
-                ],
-                'avoid_metadata': [
+                }),
+                'avoid_metadata': frozenset({
                     'filename', 'author', 'created', 'modified',
                     'subject', 'keywords', 'producer'
-                ],
+                }),
                 'min_unique_chars': 3,
                 'max_space_ratio': 0.7
             },
@@ -131,24 +157,60 @@ class ExtractorConfig:
             }
         }
     
+    @staticmethod
+    def get_default_config():
+        """Get complete default configuration for the extractor"""
+        return copy.deepcopy(_DEFAULT)
+
     @staticmethod
     def merge_configs(default_config, custom_config):
-        """Recursively merge custom config with default config"""
+        """Merge custom config into default config (iterative deep merge)"""
         if not custom_config:
             return default_config
-            
-        merged = default_config.copy()
         
-        for key, value in custom_config.items():
-            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                merged[key] = ExtractorConfig.merge_configs(merged[key], value)
-            else:
-                merged[key] = value
+        # One deep copy up front, then an explicit stack walk: no per-level
+        # shallow copies and no Python frame per nested dict
+        merged = copy.deepcopy(default_config)
+        stack = [(merged, custom_config)]
+        
+        while stack:
+            dst, src = stack.pop()
+            for key, value in src.items():
+                existing = dst.get(key)
+                if isinstance(existing, dict) and isinstance(value, (dict, types.MappingProxyType)):
+                    stack.append((existing, value))
+                else:
+                    # Frozen preset levels (MappingProxyType) are only
+                    # materialized here, at the point they are written
+                    dst[key] = _thaw(value)
         
         return merged
     
     @staticmethod
     def create_config(custom_config=None):
         """Create a configuration by merging custom with defaults"""
-        default = ExtractorConfig.get_default_config()
-        return ExtractorConfig.merge_configs(default, custom_config)
+        if not custom_config:
+            return copy.deepcopy(_DEFAULT)
+
+        # Merged results are cached by the JSON form of the overrides so
+        # repeated construction with the same preset is a dict copy, not
+        # a full recursive merge
+        try:
+            cache_key = json.dumps(custom_config, sort_keys=True, default=dict)
+        except (TypeError, ValueError):
+            cache_key = None  # non-JSON values (e.g. compiled objects) skip the cache
+
+        if cache_key is not None:
+            merged = _merged_cache.get(cache_key)
+            if merged is None:
+                merged = ExtractorConfig.merge_configs(
+                    ExtractorConfig.get_default_config(), custom_config)
+                _merged_cache[cache_key] = merged
+            return copy.deepcopy(merged)
+
+        return ExtractorConfig.merge_configs(
+            ExtractorConfig.get_default_config(), custom_config)
+
+# Default template built once at import; callers always receive deep copies
+_DEFAULT = ExtractorConfig._build_default_config()
+_merged_cache = {}
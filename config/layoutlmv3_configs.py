@@ -3,6 +3,9 @@ LayoutLMv3 Configuration Examples
 Optimized settings for different use cases
 """
 
+import functools
+import types
+
 # High Accuracy Configuration (slower but more accurate)
 HIGH_ACCURACY_CONFIG = {
     'layoutlmv3': {
@@ -163,18 +166,44 @@ ACADEMIC_CONFIG = {
     }
 }
 
+def _freeze(value):
+    """Recursively wrap dicts in read-only MappingProxyType views"""
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+# The shared templates are immutable: any attempt to mutate a preset in
+# place raises instead of silently polluting future callers
+HIGH_ACCURACY_CONFIG = _freeze(HIGH_ACCURACY_CONFIG)
+BALANCED_CONFIG = _freeze(BALANCED_CONFIG)
+FAST_CONFIG = _freeze(FAST_CONFIG)
+CPU_ONLY_CONFIG = _freeze(CPU_ONLY_CONFIG)
+MULTILINGUAL_CONFIG = _freeze(MULTILINGUAL_CONFIG)
+ACADEMIC_CONFIG = _freeze(ACADEMIC_CONFIG)
+
+# Single source of truth for the preset registry; CONFIG_NAMES feeds
+# argparse choices so the CLI can never drift from the presets here
+CONFIGS = {
+    'high_accuracy': HIGH_ACCURACY_CONFIG,
+    'balanced': BALANCED_CONFIG,
+    'fast': FAST_CONFIG,
+    'cpu_only': CPU_ONLY_CONFIG,
+    'multilingual': MULTILINGUAL_CONFIG,
+    'academic': ACADEMIC_CONFIG
+}
+CONFIG_NAMES = tuple(CONFIGS)
+
+@functools.lru_cache(maxsize=None)
+def _get_config_template(use_case: str):
+    """Resolve the shared preset template for a use case (cached)"""
+    return CONFIGS.get(use_case, BALANCED_CONFIG)
+
 def get_config_for_use_case(use_case: str):
-    """Get optimized configuration for specific use case"""
-    configs = {
-        'high_accuracy': HIGH_ACCURACY_CONFIG,
-        'balanced': BALANCED_CONFIG,
-        'fast': FAST_CONFIG,
-        'cpu_only': CPU_ONLY_CONFIG,
-        'multilingual': MULTILINGUAL_CONFIG,
-        'academic': ACADEMIC_CONFIG
-    }
-    
-    return configs.get(use_case, BALANCED_CONFIG)
+    """Get optimized configuration for specific use case (read-only view)"""
+    # Read-only consumers share the frozen template with zero copying;
+    # ExtractorConfig.merge_configs materializes plain dicts only at the
+    # levels it actually writes
+    return _get_config_template(use_case)
 
 def print_config_recommendations():
     """Print configuration recommendations"""
@@ -3,6 +3,8 @@ LayoutLMv3 integration for enhanced document understanding
 Combines text, layout, and visual features for superior heading detection
 """
 
+import os
+
 import torch
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
@@ -11,6 +13,27 @@ import fitz  # PyMuPDF
 from transformers import LayoutLMv3Processor, LayoutLMv3ForTokenClassification
 import cv2
 
+class _LogitsOutput:
+    """Minimal stand-in for the transformers model output object"""
+    __slots__ = ('logits',)
+    
+    def __init__(self, logits):
+        self.logits = logits
+
+class _FrozenModel:
+    """Wraps a frozen TorchScript module behind the .logits interface"""
+    
+    def __init__(self, module):
+        self._module = module
+    
+    def __call__(self, **encoding):
+        out = self._module(**encoding)
+        if isinstance(out, dict):
+            return _LogitsOutput(out['logits'])
+        if isinstance(out, (tuple, list)):
+            return _LogitsOutput(out[0])
+        return _LogitsOutput(out)
+
 class LayoutLMv3Enhancer:
     """Enhanced document analysis using LayoutLMv3 multimodal transformer"""
     
@@ -26,6 +49,17 @@ class LayoutLMv3Enhancer:
         self.initialized = False
         self.max_model_size_mb = 200.0  # Strict model size limit
         
+        # Per-page analysis cache keyed by (id(doc), page_num): document
+        # analysis and heading enhancement hit the same pages, so the
+        # second pass becomes a dict lookup instead of a model forward.
+        # Valid only within one document — id() can be reused after the
+        # document is freed, so the extractor clears it between documents
+        self._page_cache = {}
+        
+        # Raw text dicts are cached separately: they are reusable even
+        # when the inference result for the page is not
+        self._textdict_cache = {}
+        
         # Heading classification labels (for token classification)
         self.label_map = {
             0: 'O',      # Other/Not a heading
@@ -39,6 +73,10 @@ class LayoutLMv3Enhancer:
             8: 'I-TITLE'  # Inside title
         }
         
+        # label id -> level code (0=none, 1=H1, 2=H2, 3=H3, 4=TITLE) for
+        # vectorized aggregation; mirrors label_map order above
+        self._id_to_level = np.array([0, 1, 1, 2, 2, 3, 3, 4, 4], dtype=np.int8)
+        
         # Confidence thresholds
         self.confidence_thresholds = {
             'title': 0.8,
@@ -69,11 +107,37 @@ class LayoutLMv3Enhancer:
                     self.model_name, 
                     local_files_only=True
                 )
-                self.model = LayoutLMv3ForTokenClassification.from_pretrained(
-                    self.model_name,
-                    num_labels=len(self.label_map),
-                    local_files_only=True
-                )
+                try:
+                    # safetensors weights are memory-mapped and paged in
+                    # lazily, and meta-tensor init (low_cpu_mem_usage)
+                    # avoids a second full-size allocation during load
+                    self.model = LayoutLMv3ForTokenClassification.from_pretrained(
+                        self.model_name,
+                        num_labels=len(self.label_map),
+                        local_files_only=True,
+                        use_safetensors=True,
+                        torch_dtype=torch.float32,
+                        low_cpu_mem_usage=True
+                    )
+                except Exception:
+                    # Older local caches may only hold pickled .bin weights
+                    self.model = LayoutLMv3ForTokenClassification.from_pretrained(
+                        self.model_name,
+                        num_labels=len(self.label_map),
+                        local_files_only=True
+                    )
+                
+                # Int8 dynamic quantization of the Linear layers: the
+                # model is dominated by attention/FFN projections, so this
+                # cuts weight memory ~4x and engages the CPU int8 GEMM
+                # kernels instead of fp32 ones
+                if self.config.get('layoutlm_int8', True):
+                    try:
+                        self.model = torch.quantization.quantize_dynamic(
+                            self.model, {torch.nn.Linear}, dtype=torch.qint8
+                        )
+                    except Exception:
+                        pass
                 
                 # Validate model size constraint
                 model_size_mb = self._estimate_model_size()
@@ -89,6 +153,70 @@ class LayoutLMv3Enhancer:
             self.model.to(self.device)
             self.model.eval()
             
+            # NHWC weights for the visual patch-embedding conv: the oneDNN
+            # CPU conv kernels are written for channels_last
+            try:
+                self.model = self.model.to(memory_format=torch.channels_last)
+            except Exception:
+                pass
+            
+            # CPU math setup: give the transformer GEMMs real intra-op
+            # parallelism (PyTorch defaults can be too low under some
+            # launchers) and make sure the oneDNN kernels are on
+            torch.set_num_threads(
+                self.config.get('layoutlm_threads', max(1, (os.cpu_count() or 2) // 2))
+            )
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # interop thread count can only be set once per process
+            if hasattr(torch.backends, 'mkldnn'):
+                torch.backends.mkldnn.enabled = True
+            
+            # Compile the model (PyTorch 2.x) to remove per-op Python
+            # dispatch overhead on repeated single-batch CPU inference;
+            # if Dynamo is missing or bails, fall back to a traced and
+            # frozen TorchScript graph, which still inlines constants and
+            # fuses elementwise ops
+            if self.config.get('layoutlm_compile', True):
+                # Dummy input pays the one-shot compile/trace cost here,
+                # not on the first real page
+                warmup = self.processor(
+                    Image.new("RGB", (224, 224), "white"),
+                    ["warmup"],
+                    boxes=[[0, 0, 10, 10]],
+                    return_tensors="pt",
+                    truncation=True,
+                    padding=True
+                )
+                graph_model = None
+                if hasattr(torch, 'compile'):
+                    try:
+                        compiled = torch.compile(self.model, mode="reduce-overhead", dynamic=True)
+                        # Warm up in inference_mode so the traced graph
+                        # matches the mode used at call time
+                        with torch.inference_mode():
+                            compiled(**warmup)
+                        graph_model = compiled
+                    except Exception:
+                        graph_model = None
+                if graph_model is None:
+                    try:
+                        with torch.inference_mode():
+                            traced = torch.jit.trace(
+                                self.model,
+                                example_kwarg_inputs=dict(warmup),
+                                strict=False
+                            )
+                            frozen = _FrozenModel(torch.jit.freeze(traced))
+                            frozen(**warmup)
+                        graph_model = frozen
+                    except Exception:
+                        # Eager mode still works, just slower
+                        graph_model = None
+                if graph_model is not None:
+                    self.model = graph_model
+            
             self.initialized = True
             print(f"✅ LayoutLMv3 model loaded ({model_size_mb:.1f}MB) on CPU")
             return True
@@ -110,10 +238,11 @@ class LayoutLMv3Enhancer:
             # Process first few pages for document understanding
             pages_to_analyze = min(3, len(doc))
             
-            multimodal_features = []
-            for page_num in range(pages_to_analyze):
-                page_features = self._analyze_page_with_layoutlm(doc, page_num)
-                multimodal_features.append(page_features)
+            # One batched forward over all pages instead of a model call
+            # per page
+            multimodal_features = self._analyze_pages_batch(
+                doc, list(range(pages_to_analyze))
+            )
             
             # Aggregate multimodal insights
             enhanced_profile['layoutlm_features'] = self._aggregate_multimodal_features(multimodal_features)
@@ -156,95 +285,194 @@ class LayoutLMv3Enhancer:
         
         return enhanced_candidates
     
+    def clear_cache(self):
+        """Drop cached per-page analyses (called between documents)"""
+        self._page_cache.clear()
+        self._textdict_cache.clear()
+    
+    def _get_text_dict(self, doc, page_num: int) -> Dict:
+        """Get the page's text dict, memoized per (doc, page)"""
+        cache_key = (id(doc), page_num)
+        text_dict = self._textdict_cache.get(cache_key)
+        if text_dict is None:
+            # Text dicts for long pages are big; keep only the handful of
+            # pages a single document analysis touches
+            if len(self._textdict_cache) >= 8:
+                self._textdict_cache.clear()
+            text_dict = doc[page_num].get_text("dict")
+            self._textdict_cache[cache_key] = text_dict
+        return text_dict
+    
     def _analyze_page_with_layoutlm(self, doc, page_num: int) -> Dict[str, Any]:
         """Analyze a single page with LayoutLMv3"""
-        
+        return self._analyze_pages_batch(doc, [page_num])[0]
+    
+    def _prepare_page(self, doc, page_num: int):
+        """Render one page and extract its words and normalized boxes"""
         page = doc[page_num]
         
-        # Convert page to image
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better quality
-        img_data = pix.tobytes("png")
-        image = Image.open(io.BytesIO(img_data)).convert("RGB")
-        
-        # Extract text with bounding boxes
-        text_dict = page.get_text("dict")
-        words, boxes = self._extract_words_and_boxes(text_dict)
-        
-        if not words:
-            return {'predictions': [], 'confidence': 0.0}
-        
-        # Prepare input for LayoutLMv3
-        encoding = self.processor(
-            image, 
-            words, 
-            boxes=boxes, 
-            return_tensors="pt",
-            truncation=True,
-            padding=True
+        # Extract text first: empty, scanned and cover pages skip the
+        # rasterization below entirely
+        text_dict = self._get_text_dict(doc, page_num)
+        words, boxes = self._extract_words_and_boxes(
+            text_dict, page.rect.width, page.rect.height
         )
+        if not words:
+            return None, [], []
+        
+        # Convert page to image straight from the raw pixmap samples,
+        # skipping the PNG encode/decode round trip entirely. The
+        # processor resizes to 224x224 internally, so rendering above 1x
+        # only burns rasterization time and pixmap RAM
+        zoom = self.config.get('layoutlm_render_zoom', 1.0)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+        if pix.n == 4:
+            arr = arr[:, :, :3]  # drop alpha
+        image = Image.fromarray(arr, mode="RGB")
+        
+        return image, words, boxes
+    
+    def _analyze_pages_batch(self, doc, page_nums: List[int]) -> List[Dict[str, Any]]:
+        """Analyze several pages with one batched LayoutLMv3 forward"""
         
-        # Move to device
-        for key in encoding:
-            if isinstance(encoding[key], torch.Tensor):
-                encoding[key] = encoding[key].to(self.device)
-        
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**encoding)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
-        # Process predictions
-        predicted_labels = torch.argmax(predictions, dim=-1)
-        confidence_scores = torch.max(predictions, dim=-1)[0]
+        results = {}
+        pending = []
         
-        return {
-            'words': words,
-            'boxes': boxes,
-            'predictions': predicted_labels.cpu().numpy(),
-            'confidences': confidence_scores.cpu().numpy(),
-            'page_num': page_num
-        }
+        for page_num in page_nums:
+            cached = self._page_cache.get((id(doc), page_num))
+            if cached is not None:
+                results[page_num] = cached
+                continue
+            
+            image, words, boxes = self._prepare_page(doc, page_num)
+            if not words:
+                # Empty arrays (not lists) so consumers can test
+                # .size on cache hits without special-casing
+                result = {'words': [], 'boxes': [],
+                          'predictions': np.array([], dtype=np.intp),
+                          'confidences': np.array([], dtype=np.float64),
+                          'page_num': page_num}
+                self._page_cache[(id(doc), page_num)] = result
+                results[page_num] = result
+            else:
+                pending.append((page_num, image, words, boxes))
+        
+        # Sort the remaining pages by word count and split where a long
+        # page would force heavy padding onto a much shorter one: padded
+        # tokens are masked out of the results but the transformer still
+        # multiplies them
+        if pending:
+            pending.sort(key=lambda entry: len(entry[2]))
+            sub_batches = [[pending[0]]]
+            for entry in pending[1:]:
+                if len(entry[2]) > 2 * len(sub_batches[-1][0][2]) + 32:
+                    sub_batches.append([entry])
+                else:
+                    sub_batches[-1].append(entry)
+        else:
+            sub_batches = []
+        
+        for batch in sub_batches:
+            # Batched input: one op-dispatch sequence and larger GEMMs
+            # instead of a full forward per page
+            encoding = self.processor(
+                [entry[1] for entry in batch],
+                [entry[2] for entry in batch],
+                boxes=[entry[3] for entry in batch],
+                return_tensors="pt",
+                truncation=True,
+                max_length=512,
+                padding="longest"
+            )
+            
+            # Move to device; page images go through in channels_last to
+            # match the conv weight layout set at init
+            for key in encoding:
+                if isinstance(encoding[key], torch.Tensor):
+                    encoding[key] = encoding[key].to(self.device)
+            if "pixel_values" in encoding:
+                encoding["pixel_values"] = encoding["pixel_values"].to(
+                    memory_format=torch.channels_last
+                )
+            
+            # Run inference (inference_mode skips autograd view/version
+            # tracking that no_grad still pays for); bf16 autocast is
+            # opt-in since it trades a little precision for ~1.5x GEMM
+            # throughput on AVX-512/AMX machines
+            with torch.inference_mode():
+                if self.config.get('layoutlm_bf16', False):
+                    with torch.autocast("cpu", dtype=torch.bfloat16):
+                        outputs = self.model(**encoding)
+                else:
+                    outputs = self.model(**encoding)
+                # argmax is unchanged under softmax, so take the winner
+                # straight from the logits in one fused max and normalize
+                # only the winning class; this skips materializing the
+                # full softmax matrix and a second reduction pass
+                logits = outputs.logits.float()
+                max_logits, predicted = torch.max(logits, dim=-1)
+                confidence = 1.0 / torch.exp(logits - max_logits.unsqueeze(-1)).sum(dim=-1)
+            
+            # Process predictions; the attention mask strips the padding
+            # added to align shorter pages in the batch. Everything is
+            # already on CPU (self.device is pinned there), so .numpy()
+            # avoids the shadow copy a redundant .cpu() would allocate
+            predicted_labels = predicted.numpy()
+            confidence_scores = confidence.numpy()
+            real_tokens = encoding['attention_mask'].numpy().astype(bool)
+            
+            for row, (page_num, image, words, boxes) in enumerate(batch):
+                result = {
+                    'words': words,
+                    'boxes': boxes,
+                    'predictions': predicted_labels[row][real_tokens[row]],
+                    'confidences': confidence_scores[row][real_tokens[row]],
+                    'page_num': page_num
+                }
+                self._page_cache[(id(doc), page_num)] = result
+                results[page_num] = result
+        
+        return [results[page_num] for page_num in page_nums]
     
-    def _extract_words_and_boxes(self, text_dict: Dict) -> Tuple[List[str], List[List[int]]]:
+    def _extract_words_and_boxes(self, text_dict: Dict, page_width: float,
+                                 page_height: float) -> Tuple[List[str], List[List[int]]]:
         """Extract words and their bounding boxes from PyMuPDF text dict"""
         
         words = []
         boxes = []
         
+        # Normalization to the 1000x1000 LayoutLMv3 grid uses the actual
+        # page size (the previous hardcoded A4 geometry skewed every box
+        # on non-A4 pages)
+        scale = np.array([1000.0 / page_width, 1000.0 / page_height,
+                          1000.0 / page_width, 1000.0 / page_height])
+        
         for block in text_dict.get("blocks", []):
             if "lines" in block:
                 for line in block["lines"]:
                     for span in line["spans"]:
                         text = span["text"].strip()
-                        if text:
-                            # Split text into words
-                            span_words = text.split()
-                            bbox = span["bbox"]
-                            
-                            # Estimate individual word bounding boxes
-                            word_width = (bbox[2] - bbox[0]) / len(span_words) if span_words else 0
-                            
-                            for i, word in enumerate(span_words):
-                                words.append(word)
-                                
-                                # Estimate word bounding box
-                                x0 = bbox[0] + i * word_width
-                                x1 = x0 + word_width
-                                y0 = bbox[1]
-                                y1 = bbox[3]
-                                
-                                # Convert to LayoutLMv3 format (normalize to 1000x1000)
-                                # Assuming page dimensions - you might need to get actual page size
-                                page_width, page_height = 595, 842  # A4 default
-                                
-                                normalized_box = [
-                                    int((x0 / page_width) * 1000),
-                                    int((y0 / page_height) * 1000),
-                                    int((x1 / page_width) * 1000),
-                                    int((y1 / page_height) * 1000)
-                                ]
-                                
-                                boxes.append(normalized_box)
+                        if not text:
+                            continue
+                        
+                        span_words = text.split()
+                        n = len(span_words)
+                        bbox = span["bbox"]
+                        
+                        # Estimate all word boxes of the span in one
+                        # vectorized pass instead of per-word arithmetic
+                        word_width = (bbox[2] - bbox[0]) / n
+                        xs = bbox[0] + np.arange(n) * word_width
+                        span_boxes = np.column_stack([
+                            xs,
+                            np.full(n, bbox[1]),
+                            xs + word_width,
+                            np.full(n, bbox[3])
+                        ]) * scale
+                        
+                        words.extend(span_words)
+                        boxes.extend(span_boxes.astype(np.int32).tolist())
         
         return words, boxes
     
@@ -257,33 +485,39 @@ class LayoutLMv3Enhancer:
         if not page_analysis.get('predictions', []).size:
             return candidates
         
-        enhanced_candidates = []
+        # Candidates are annotated in place: the per-candidate dict copy
+        # bought no isolation (the pipeline consumes the returned list as
+        # the new truth) and cost an allocation per candidate. Repeated
+        # headings ("Introduction" on several levels, running titles)
+        # share one prediction lookup per page via the seen map
+        seen = {}
         
         for candidate in candidates:
-            enhanced_candidate = candidate.copy()
-            
             # Find matching words in LayoutLMv3 predictions
             candidate_text = candidate.get('text', '').strip()
-            layoutlm_prediction = self._find_text_in_predictions(
-                candidate_text, 
-                page_analysis
-            )
+            lookup_key = candidate_text.lower()
+            if lookup_key in seen:
+                layoutlm_prediction = seen[lookup_key]
+            else:
+                layoutlm_prediction = self._find_text_in_predictions(
+                    candidate_text, 
+                    page_analysis
+                )
+                seen[lookup_key] = layoutlm_prediction
             
             if layoutlm_prediction:
                 # Add LayoutLMv3 insights
-                enhanced_candidate['layoutlm_label'] = layoutlm_prediction['label']
-                enhanced_candidate['layoutlm_confidence'] = layoutlm_prediction['confidence']
+                candidate['layoutlm_label'] = layoutlm_prediction['label']
+                candidate['layoutlm_confidence'] = layoutlm_prediction['confidence']
                 
                 # Update level based on LayoutLMv3 if confident enough
                 if layoutlm_prediction['confidence'] > self.confidence_thresholds.get(
                     layoutlm_prediction['level'], 0.5
                 ):
-                    enhanced_candidate['level'] = layoutlm_prediction['level']
-                    enhanced_candidate['level_source'] = 'layoutlmv3'
-            
-            enhanced_candidates.append(enhanced_candidate)
+                    candidate['level'] = layoutlm_prediction['level']
+                    candidate['level_source'] = 'layoutlmv3'
         
-        return enhanced_candidates
+        return candidates
     
     def _find_text_in_predictions(self, text: str, page_analysis: Dict) -> Optional[Dict]:
         """Find text in LayoutLMv3 predictions and return classification"""
@@ -295,38 +529,55 @@ class LayoutLMv3Enhancer:
         if len(words) != len(predictions) or len(words) != len(confidences):
             return None
         
-        # Simple text matching (could be improved with fuzzy matching)
         text_words = text.lower().split()
+        n = len(text_words)
+        if n == 0 or n > len(words):
+            return None
+        
+        # Lowercased word hashes are computed once per page and reused for
+        # every candidate; matching becomes one vectorized window compare
+        # instead of a Python scan per candidate
+        word_ids = page_analysis.get('_word_ids')
+        if word_ids is None:
+            word_ids = np.array([hash(w.lower()) & 0xFFFFFFFF for w in words],
+                                dtype=np.uint32)
+            page_analysis['_word_ids'] = word_ids
+        
+        target = np.array([hash(w) & 0xFFFFFFFF for w in text_words], dtype=np.uint32)
+        windows = np.lib.stride_tricks.sliding_window_view(word_ids, n)
+        match_offsets = np.nonzero((windows == target).all(axis=1))[0]
+        
+        predictions = np.asarray(predictions)
+        confidences = np.asarray(confidences)
         
         best_match = None
         best_confidence = 0.0
         
-        # Sliding window to find the best match
-        for i in range(len(words) - len(text_words) + 1):
-            window_words = [w.lower() for w in words[i:i+len(text_words)]]
+        for i in match_offsets:
+            # Hash equality can collide; confirm the actual words match
+            if [w.lower() for w in words[i:i + n]] != text_words:
+                continue
             
-            # Check if words match
-            if window_words == text_words:
-                window_predictions = predictions[i:i+len(text_words)]
-                window_confidences = confidences[i:i+len(text_words)]
-                
-                # Get most confident prediction in the window
-                max_conf_idx = np.argmax(window_confidences)
-                prediction_id = window_predictions[max_conf_idx]
-                confidence = window_confidences[max_conf_idx]
+            window_predictions = predictions[i:i + n]
+            window_confidences = confidences[i:i + n]
+            
+            # Get most confident prediction in the window
+            max_conf_idx = np.argmax(window_confidences)
+            prediction_id = int(window_predictions[max_conf_idx])
+            confidence = float(window_confidences[max_conf_idx])
+            
+            if confidence > best_confidence:
+                label = self.label_map.get(prediction_id, 'O')
+                level = self._label_to_level(label)
                 
-                if confidence > best_confidence:
-                    label = self.label_map.get(prediction_id, 'O')
-                    level = self._label_to_level(label)
-                    
-                    if level:  # Only consider actual heading predictions
-                        best_match = {
-                            'label': label,
-                            'level': level,
-                            'confidence': float(confidence),
-                            'prediction_id': int(prediction_id)
-                        }
-                        best_confidence = confidence
+                if level:  # Only consider actual heading predictions
+                    best_match = {
+                        'label': label,
+                        'level': level,
+                        'confidence': confidence,
+                        'prediction_id': prediction_id
+                    }
+                    best_confidence = confidence
         
         return best_match
     
@@ -369,31 +620,30 @@ class LayoutLMv3Enhancer:
     def _aggregate_multimodal_features(self, page_features: List[Dict]) -> Dict[str, Any]:
         """Aggregate multimodal features across pages"""
         
-        total_predictions = 0
-        heading_predictions = 0
-        avg_confidence = 0.0
+        predictions = np.concatenate(
+            [np.asarray(f.get('predictions', []), dtype=np.intp).ravel()
+             for f in page_features]
+        ) if page_features else np.array([], dtype=np.intp)
+        confidences = np.concatenate(
+            [np.asarray(f.get('confidences', []), dtype=np.float64).ravel()
+             for f in page_features]
+        ) if page_features else np.array([], dtype=np.float64)
         
-        level_counts = {'H1': 0, 'H2': 0, 'H3': 0, 'TITLE': 0}
-        
-        for features in page_features:
-            predictions = features.get('predictions', [])
-            confidences = features.get('confidences', [])
-            
-            for pred_id, conf in zip(predictions, confidences):
-                total_predictions += 1
-                label = self.label_map.get(pred_id, 'O')
-                level = self._label_to_level(label)
-                
-                if level:
-                    heading_predictions += 1
-                    level_counts[level] += 1
-                
-                avg_confidence += conf
+        total_predictions = int(predictions.size)
         
         if total_predictions > 0:
-            avg_confidence /= total_predictions
+            # Table lookup plus bincount replaces the per-token Python
+            # loop of dict gets and substring checks
+            levels = self._id_to_level[predictions]
+            counts = np.bincount(levels, minlength=5)
+            heading_predictions = total_predictions - int(counts[0])
+            level_counts = {'H1': int(counts[1]), 'H2': int(counts[2]),
+                            'H3': int(counts[3]), 'TITLE': int(counts[4])}
+            avg_confidence = float(confidences.mean()) if confidences.size else 0.0
             heading_ratio = heading_predictions / total_predictions
         else:
+            heading_predictions = 0
+            level_counts = {'H1': 0, 'H2': 0, 'H3': 0, 'TITLE': 0}
             avg_confidence = 0.0
             heading_ratio = 0.0
         
@@ -412,12 +662,14 @@ class LayoutLMv3Enhancer:
             return 0.0
         
         try:
-            # Count parameters and estimate size
-            total_params = sum(p.numel() for p in self.model.parameters())
-            # Assume 4 bytes per parameter (float32)
-            size_bytes = total_params * 4
-            size_mb = size_bytes / (1024 * 1024)
-            return size_mb
+            # Remaining fp32/fp16 parameters at their true element size
+            size_bytes = sum(p.numel() * p.element_size() for p in self.model.parameters())
+            # Dynamic-quantized Linear weights live in packed params (int8,
+            # one byte each) and do not show up in parameters()
+            for module in self.model.modules():
+                if isinstance(module, torch.nn.quantized.dynamic.Linear):
+                    size_bytes += module.weight().numel()
+            return size_bytes / (1024 * 1024)
         except Exception:
             # Conservative estimate for LayoutLMv3-base
             return 150.0  # Safe estimate under 200MB limit
@@ -432,6 +684,3 @@ class LayoutLMv3Enhancer:
             'labels': list(self.label_map.values()),
             'confidence_thresholds': self.confidence_thresholds
         }
-
-# Import fix for missing io module
-import io
@@ -4,8 +4,28 @@ Determines heading levels using multiple signals beyond font size
 """
 
 import re
+from heapq import nlargest
 from typing import List, Dict, Any
 
+# All structural numbering patterns in one group-tagged regex: a single
+# match call classifies the candidate, with the deepest numbering tried
+# first so "1.1.1" never stops at a shallower branch
+_STRUCTURAL_RE = re.compile(
+    r'(?P<h3>^\d+\.\d+\.\d+\s+[A-Z])'  # "1.1.1 Details"
+    r'|(?P<h2_num>^\d+\.\d+\s+[A-Z])'    # "1.1 Overview"
+    r'|(?P<h1_num>^\d+\.\s+[A-Z])'        # "1. Introduction"
+    r'|(?P<h2_letter>^[A-Z]\.\s+[A-Z])'    # "A. Section"
+    r'|(?P<h1_roman>^[IVX]+\.\s+[A-Z])'    # "I. Introduction"
+)
+
+_STRUCTURAL_LEVELS = {
+    'h3': 'H3',
+    'h2_num': 'H2',
+    'h1_num': 'H1',
+    'h2_letter': 'H2',
+    'h1_roman': 'H1',
+}
+
 class LevelDeterminer:
     """Determines heading levels using multiple signals"""
     
@@ -20,10 +40,15 @@ class LevelDeterminer:
         # Sort by page, then by y-position
         candidates.sort(key=lambda x: (x['page'], x['bbox'][1] if x['bbox'] else 0))
         
+        # Rank the font sizes once: score-based levels only compare against
+        # the top three sizes, so a bounded heap selection replaces the
+        # full descending sort of every distinct size
+        top_sizes = nlargest(3, {c['size'] for c in candidates})
+        
         # Analyze multiple factors for heading level determination
         structured = []
         for candidate in candidates:
-            level = self._determine_heading_level(candidate, candidates)
+            level = self._determine_heading_level(candidate, top_sizes)
             
             structured.append({
                 "level": level,
@@ -33,7 +58,7 @@ class LevelDeterminer:
         
         return structured
     
-    def _determine_heading_level(self, candidate: Dict, all_candidates: List[Dict]) -> str:
+    def _determine_heading_level(self, candidate: Dict, top_sizes: List[float]) -> str:
         """Determine heading level using multiple signals beyond font size"""
         text = candidate['text']
         size = candidate['size']
@@ -44,8 +69,10 @@ class LevelDeterminer:
         if structural_level:
             return structural_level
         
-        # Factor 2: Content-based patterns
-        content_level = self._get_content_based_level(text)
+        # Factor 2: Content-based patterns (lowered text is cached on the
+        # candidate by the extractor)
+        text_lower = candidate['text_lower'] if 'text_lower' in candidate else text.lower()
+        content_level = self._get_content_based_level(text_lower)
         if content_level:
             return content_level
         
@@ -55,32 +82,18 @@ class LevelDeterminer:
             return position_level
         
         # Factor 4: Combined scoring approach
-        return self._get_score_based_level(candidate, all_candidates)
+        return self._get_score_based_level(candidate, top_sizes)
     
     def _get_structural_level(self, text: str) -> str:
         """Get level based on structural patterns like numbering"""
-        # Check for numbered section patterns
-        if re.match(r'^\d+\.\s+[A-Z]', text):  # "1. Introduction"
-            return "H1"
-        elif re.match(r'^\d+\.\d+\s+[A-Z]', text):  # "1.1 Overview"
-            return "H2"
-        elif re.match(r'^\d+\.\d+\.\d+\s+[A-Z]', text):  # "1.1.1 Details"
-            return "H3"
-        
-        # Check for lettered sections
-        if re.match(r'^[A-Z]\.\s+[A-Z]', text):  # "A. Section"
-            return "H2"
-        
-        # Check for roman numerals
-        if re.match(r'^[IVX]+\.\s+[A-Z]', text):  # "I. Introduction"
-            return "H1"
+        match = _STRUCTURAL_RE.match(text)
+        if match:
+            return _STRUCTURAL_LEVELS[match.lastgroup]
         
         return ""
     
-    def _get_content_based_level(self, text: str) -> str:
+    def _get_content_based_level(self, text_lower: str) -> str:
         """Get level based on content keywords"""
-        text_lower = text.lower()
-        
         # Document structure keywords suggest main sections
         main_section_keywords = [
             'introduction', 'overview', 'background', 'conclusion', 'summary',
@@ -105,25 +118,22 @@ class LevelDeterminer:
         
         return ""
     
-    def _get_score_based_level(self, candidate: Dict, all_candidates: List[Dict]) -> str:
+    def _get_score_based_level(self, candidate: Dict, top_sizes: List[float]) -> str:
         """Get level using combined scoring approach"""
         text = candidate['text']
         size = candidate['size']
         bold = candidate.get('bold', False)
         
-        # Font analysis (as backup, not primary)
-        font_sizes = [c['size'] for c in all_candidates]
-        unique_sizes = sorted(set(font_sizes), reverse=True)
-        
         # Combined scoring approach
         score = 0
         
-        # Size contribution (reduced weight)
-        if size in unique_sizes[:1]:
+        # Size contribution (reduced weight): scalar equality against the
+        # document-wide top three sizes computed in build_hierarchy
+        if top_sizes and size == top_sizes[0]:
             score += 3
-        elif size in unique_sizes[1:2]:
+        elif len(top_sizes) > 1 and size == top_sizes[1]:
             score += 2
-        elif size in unique_sizes[2:3]:
+        elif len(top_sizes) > 2 and size == top_sizes[2]:
             score += 1
         
         # Bold contribution
@@ -140,8 +150,10 @@ class LevelDeterminer:
         if candidate['page'] <= 3:
             score += 1
         
-        # Capitalization pattern
-        if text.istitle() or (len(text.split()) <= 3 and text.isupper()):
+        # Capitalization pattern (flags cached at candidate creation)
+        is_title = candidate['is_title'] if 'is_title' in candidate else text.istitle()
+        is_upper = candidate['is_upper'] if 'is_upper' in candidate else text.isupper()
+        if is_title or (len(text.split()) <= 3 and is_upper):
             score += 1
         
         # Convert score to level
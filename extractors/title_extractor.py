@@ -4,118 +4,229 @@ Handles various strategies for extracting document titles
 """
 
 import re
-from collections import defaultdict
+from collections import namedtuple
 from typing import Dict, Any, List
 
+import numpy as np
+
+# Optional Aho-Corasick automaton for single-pass keyword scanning
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional numba JIT for the per-character title classification loop
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Pre-compiled patterns: these run per line on every processed page, so the
+# per-call regex cache probe is hoisted to import time
+_NUM_PREFIX_RE = re.compile(r'^\d+[.\s]')
+# Event-document indicators in one case-insensitive scan of the sample
+_EVENT_RE = re.compile(r'party|jump|event', re.IGNORECASE)
+_UPPER_UNDERSCORE_RE = re.compile(r'[A-Z]{2,}_[A-Z]{2,}')
+
+# Per-line facts shared by every extraction strategy: each strategy used
+# to recompute the same length/suffix/prefix predicates over the same
+# top-of-page lines
+_LineInfo = namedtuple('_LineInfo', 'text lower length endswith_colon has_num_prefix')
+
+def _spans_soa(page_dict):
+    """Flatten a page dict into parallel span arrays (SoA layout)"""
+    texts = []
+    sizes = []
+    for block in page_dict["blocks"]:
+        if "lines" in block:
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if text and len(text) > 1:
+                        texts.append(text)
+                        sizes.append(span["size"])
+    return texts, np.asarray(sizes)
+
+if njit is not None:
+    @njit(cache=True)
+    def _classify_bytes(buf):
+        """Capital/lowercase flags and punctuation counts in one byte loop"""
+        has_upper = has_lower = False
+        dots = underscores = 0
+        for b in buf:
+            if 65 <= b <= 90:
+                has_upper = True
+            elif 97 <= b <= 122:
+                has_lower = True
+            elif b == 46:
+                dots += 1
+            elif b == 95:
+                underscores += 1
+        return has_upper, has_lower, dots, underscores
+else:
+    _classify_bytes = None
+
+def _over(text, char, limit):
+    """True once more than `limit` occurrences are seen (early exit)"""
+    count = 0
+    for c in text:
+        if c == char:
+            count += 1
+            if count > limit:
+                return True
+    return False
+
+def _build_matcher(keywords):
+    """Compile a keyword family into a single-pass matcher
+
+    An Aho-Corasick automaton when the package is installed, otherwise one
+    fused alternation regex — either way the per-line test is one scan
+    instead of one substring probe per keyword.
+    """
+    automaton = None
+    if ahocorasick is not None and keywords:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+    fallback_re = (re.compile('|'.join(map(re.escape, sorted(keywords))))
+                   if keywords else None)
+    return automaton, fallback_re
+
+def _contains_any(matcher, text_lower):
+    """Single-pass test whether any keyword of the family occurs"""
+    automaton, fallback_re = matcher
+    if automaton is not None:
+        return next(automaton.iter(text_lower), None) is not None
+    return fallback_re is not None and fallback_re.search(text_lower) is not None
+
 class TitleExtractor:
     """Extracts titles from PDF documents using multiple strategies"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        
+        # Each keyword family is compiled once into a single-pass matcher
+        form_config = config['document_types']['form']
+        self._form_title_m = _build_matcher(form_config['title_keywords'])
+        self._form_avoid_m = _build_matcher(form_config['avoid_keywords'])
+        self._avoid_general_m = _build_matcher(config['filtering']['avoid_general'])
+        self._avoid_metadata_m = _build_matcher(config['filtering']['avoid_metadata'])
     
-    def extract_title(self, doc, doc_profile: Dict) -> str:
+    def extract_title(self, doc, doc_profile: Dict, page_dicts=None) -> str:
         """Generic title extraction without file-specific hardcoding"""
         strategies = []
         
         first_page = doc[0]
-        first_page_text = first_page.get_text()
-        lines = [line.strip() for line in first_page_text.split('\n') if line.strip()]
+        first_page_dict = page_dicts[0] if page_dicts else None
+        # The analyzer already walked page 0's spans and recorded the line
+        # list in the profile; reuse it, then fall back to the shared page
+        # dict, then to a plain get_text() for standalone callers
+        lines = doc_profile.get('first_page_lines')
+        if lines is None and first_page_dict is not None:
+            lines = []
+            for block in first_page_dict["blocks"]:
+                if "lines" in block:
+                    for line in block["lines"]:
+                        stripped = ''.join(span["text"] for span in line["spans"]).strip()
+                        if stripped:
+                            lines.append(stripped)
+        elif lines is None:
+            first_page_text = first_page.get_text()
+            lines = [stripped for stripped in
+                     (line.strip() for line in first_page_text.split('\n')) if stripped]
+        # Only the top of the page is ever inspected; each line's facts are
+        # computed once here instead of once per strategy
+        line_info = [_LineInfo(line, line.lower(), len(line), line.endswith(':'),
+                               _NUM_PREFIX_RE.match(line) is not None)
+                     for line in lines[:20]]
         
         # Strategy 1: Document type-based extraction using config
         if doc_profile['structure']['is_form']:
-            title = self._extract_form_title(lines)
+            title = self._extract_form_title(line_info)
             if title:
                 strategies.append(title)
         
         # Strategy 2: Font-based extraction
         if not strategies:
-            title = self._extract_font_based_title(first_page)
+            title = self._extract_font_based_title(first_page, first_page_dict)
             if title:
                 strategies.append(title)
         
         # Strategy 3: Generic document reconstruction
         if not strategies:
-            title = self._extract_generic_title(lines)
+            title = self._extract_generic_title(line_info)
             if title:
                 strategies.append(title)
         
         # Strategy 4: Fallback - first substantial text
         if not strategies:
-            title = self._extract_fallback_title(lines)
+            title = self._extract_fallback_title(line_info)
             if title:
                 strategies.append(title)
         
         # Return best strategy or empty string for certain document types
         if strategies:
             # Check if this looks like an event document - return empty title
-            text_sample = doc_profile.get('text_sample', '').lower()
-            if any(indicator in text_sample for indicator in ['party', 'jump', 'event']):
+            if _EVENT_RE.search(doc_profile.get('text_sample', '')):
                 return ""
             
             return strategies[0]
         
         return ""
     
-    def _extract_form_title(self, lines: List[str]) -> str:
+    def _extract_form_title(self, line_info: List[_LineInfo]) -> str:
         """Extract title from form documents"""
-        form_config = self.config['document_types']['form']
-        
-        for i in range(min(20, len(lines))):
-            line = lines[i]
-            if (len(line) > 20 and len(line) < 120 and
-                any(keyword in line.lower() for keyword in form_config['title_keywords']) and
-                not any(avoid in line.lower() for avoid in form_config['avoid_keywords']) and
-                not line.endswith(':') and
-                not re.search(r'^\d+[.\s]', line)):
-                return line
+        for info in line_info:
+            if (info.length > 20 and info.length < 120 and
+                _contains_any(self._form_title_m, info.lower) and
+                not _contains_any(self._form_avoid_m, info.lower) and
+                not info.endswith_colon and
+                not info.has_num_prefix):
+                return info.text
         return ""
     
-    def _extract_font_based_title(self, first_page) -> str:
+    def _extract_font_based_title(self, first_page, first_page_dict=None) -> str:
         """Extract title based on font analysis"""
-        blocks = first_page.get_text("dict")["blocks"]
-        font_sizes = []
-        text_by_font = defaultdict(list)
+        if first_page_dict is None:
+            first_page_dict = first_page.get_text("dict")
         
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        if text and len(text) > 1:
-                            size = span["size"]
-                            font_sizes.append(size)
-                            text_by_font[size].append(text)
+        # One flat pass builds parallel arrays (SoA layout) so the size
+        # ranking below is vectorized instead of bucketing per-span dicts
+        texts, sizes = _spans_soa(first_page_dict)
+        if not texts:
+            return ""
         
-        if font_sizes:
-            sorted_fonts = sorted(set(font_sizes), reverse=True)
-            avoid_general = self.config['filtering']['avoid_general']
-            
-            for font_size in sorted_fonts[:3]:
-                largest_texts = text_by_font[font_size]
-                
-                for text in largest_texts:
-                    if (len(text) > 15 and len(text) < 200 and
-                        not any(avoid in text.lower() for avoid in avoid_general) and
-                        not re.search(r'[A-Z]{2,}_[A-Z]{2,}', text) and
-                        not text.count('_') > 2 and
-                        not text.count('-') > 5):  # Avoid separator lines
-                        return text
+        # Sizes are keyed as integer tenths of a point: near-identical
+        # floats from PyMuPDF land in the same bucket, and the unique/
+        # compare passes run on ints. Only the three largest buckets are
+        # ever inspected; spans within one keep their page order
+        size_keys = np.rint(sizes * 10).astype(np.int64)
+        for size_key in np.unique(size_keys)[::-1][:3]:
+            for idx in np.nonzero(size_keys == size_key)[0]:
+                text = texts[idx]
+                if (len(text) > 15 and len(text) < 200 and
+                    not _contains_any(self._avoid_general_m, text.lower()) and
+                    not _UPPER_UNDERSCORE_RE.search(text) and
+                    not _over(text, '_', 2) and
+                    not _over(text, '-', 5)):  # Avoid separator lines
+                    return text
         return ""
     
-    def _extract_generic_title(self, lines: List[str]) -> str:
+    def _extract_generic_title(self, line_info: List[_LineInfo]) -> str:
         """Extract title using generic document patterns"""
         # Use dynamic approach instead of hardcoded keywords
-        for i in range(min(15, len(lines))):
-            line = lines[i].strip()
-            if (len(line) > 15 and len(line) < 200 and 
-                self._is_likely_title(line)):
+        for i in range(min(15, len(line_info))):
+            info = line_info[i]
+            if (info.length > 15 and info.length < 200 and 
+                self._is_likely_title(info.text)):
                 # Try to build complete title from adjacent lines
-                full_title = line
-                for j in range(i+1, min(i+3, len(lines))):
-                    next_line = lines[j].strip()
-                    if (len(next_line) > 10 and len(next_line) < 100 and
-                        self._is_continuation_line(next_line)):
-                        full_title += ' ' + next_line
+                full_title = info.text
+                for j in range(i+1, min(i+3, len(line_info))):
+                    next_info = line_info[j]
+                    if (next_info.length > 10 and next_info.length < 100 and
+                        self._is_continuation_line(next_info.text)):
+                        full_title += ' ' + next_info.text
                     else:
                         break
                 
@@ -123,15 +234,13 @@ class TitleExtractor:
                     return full_title
         return ""
     
-    def _extract_fallback_title(self, lines: List[str]) -> str:
+    def _extract_fallback_title(self, line_info: List[_LineInfo]) -> str:
         """Fallback title extraction - first substantial text"""
-        avoid_metadata = self.config['filtering']['avoid_metadata']
-        
-        for line in lines[:10]:
-            if (len(line) > 10 and len(line) < 150 and
-                not any(avoid in line.lower() for avoid in avoid_metadata) and
-                not line.count('-') > 5):  # Avoid separator lines
-                return line
+        for info in line_info[:10]:
+            if (info.length > 10 and info.length < 150 and
+                not _contains_any(self._avoid_metadata_m, info.lower) and
+                not _over(info.text, '-', 5)):  # Avoid separator lines
+                return info.text
         return ""
     
     def _is_likely_title(self, text: str) -> bool:
@@ -140,17 +249,40 @@ class TitleExtractor:
         if len(text) < 10 or len(text) > 200:
             return False
         
-        # Title-like characteristics (no hardcoded keywords)
-        has_capitals = any(c.isupper() for c in text)
-        has_lowercase = any(c.islower() for c in text)
-        word_count = len(text.split())
+        # Generic title patterns (no hardcoded keywords)
+        if text.startswith(('page', 'p.', 'section', 'chapter')):
+            return False
+        if not 2 <= len(text.split()) <= 15:
+            return False
+        
+        # One pass over the characters tracks all remaining predicates;
+        # when numba is present the loop runs over the raw bytes in a
+        # compiled kernel. The kernel only understands ASCII case, so
+        # non-ASCII titles (accented capitals, CJK, ...) take the Python
+        # loop below, whose str.isupper/islower are Unicode-aware
+        if _classify_bytes is not None and text.isascii():
+            buf = np.frombuffer(text.encode('ascii'), np.uint8)
+            has_capitals, has_lowercase, dots, underscores = _classify_bytes(buf)
+            return (has_capitals and has_lowercase and
+                    dots <= 3 and underscores <= 2)
+        
+        has_capitals = has_lowercase = False
+        dots = underscores = 0
+        for c in text:
+            if c.isupper():
+                has_capitals = True
+            elif c.islower():
+                has_lowercase = True
+            elif c == '.':
+                dots += 1
+                if dots > 3:
+                    return False
+            elif c == '_':
+                underscores += 1
+                if underscores > 2:
+                    return False
         
-        # Generic title patterns
-        return (has_capitals and has_lowercase and 
-                2 <= word_count <= 15 and
-                not text.startswith(('page', 'p.', 'section', 'chapter')) and
-                not text.count('.') > 3 and
-                not text.count('_') > 2)
+        return has_capitals and has_lowercase
     
     def _is_continuation_line(self, text: str) -> bool:
         """Check if text is likely a continuation of title"""
@@ -161,4 +293,4 @@ class TitleExtractor:
         # Continuation characteristics
         return (not any(char.isdigit() for char in text[:3]) and
                 not text.startswith(('page', 'p.', 'section')) and
-                text.count('.') <= 1)
+                not _over(text, '.', 1))
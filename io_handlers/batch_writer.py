@@ -0,0 +1,153 @@
+"""
+Batched background writer for extraction results
+Hides output-file latency behind PDF extraction
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Outlines shorter than this are serialized in one shot; longer ones are
+# streamed so the full JSON payload never has to exist in memory
+_STREAM_MIN_ENTRIES = 1000
+
+def _dumps_pretty(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _dumps_compact(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def iter_json_chunks(result, chunk_size=64):
+    """Yield a result dict as serialized byte chunks"""
+    outline = result.get('outline')
+    if not isinstance(outline, list) or len(outline) < _STREAM_MIN_ENTRIES:
+        yield _dumps_pretty(result)
+        return
+
+    # Huge outlines go out compactly in fixed-size groups of entries, so
+    # peak memory during the write is O(chunk) instead of roughly twice
+    # the serialized document size
+    yield b'{'
+    first = True
+    for key, value in result.items():
+        if key == 'outline':
+            continue
+        yield (b'' if first else b',') + _dumps_compact(key) + b':' + _dumps_compact(value)
+        first = False
+    yield (b'' if first else b',') + b'"outline":['
+
+    group = []
+    for i, entry in enumerate(outline):
+        group.append((b',' if i else b'') + _dumps_compact(entry))
+        if len(group) >= chunk_size:
+            yield b''.join(group)
+            group = []
+    if group:
+        yield b''.join(group)
+    yield b']}'
+
+class BatchResultWriter:
+    """Writes (path, payload) jobs on a background thread in batches"""
+
+    def __init__(self, batch_size: int = 32):
+        self.batch_size = batch_size
+        self.errors = []
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, payload):
+        """Queue one output file (bytes or iterable of byte chunks)"""
+        self._ensure_thread()
+        self._queue.put((path, payload))
+
+    def flush(self):
+        """Block until every job submitted so far has been written"""
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        barrier = threading.Event()
+        self._queue.put(barrier)
+        barrier.wait()
+
+    def drain(self):
+        """Flush all pending writes, stop the thread, return write errors"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        return self.errors
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                # The thread must be a daemon: the interpreter joins
+                # non-daemon threads before atexit callbacks run, so a
+                # non-daemon writer would block shutdown in queue.get()
+                # forever and the drain below would never be reached
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                # Drain on interpreter exit as a backstop for in-process
+                # use; fork-started pool workers skip atexit entirely
+                # (they exit via os._exit), so process-mode callers must
+                # flush() before reporting a write as done
+                atexit.register(self.drain)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if isinstance(job, threading.Event):
+                job.set()
+                continue
+
+            # Collect whatever else is already queued so a burst of results
+            # is written in one wake-up instead of one per file; a flush
+            # barrier ends the batch so it is only released once every job
+            # queued before it has been written
+            batch = [job]
+            barriers = []
+            while len(batch) < self.batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    self._queue.put(None)
+                    break
+                if isinstance(extra, threading.Event):
+                    barriers.append(extra)
+                    break
+                batch.append(extra)
+
+            for path, payload in batch:
+                try:
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        if isinstance(payload, bytes):
+                            os.write(fd, payload)
+                        else:
+                            for chunk in payload:
+                                os.write(fd, chunk)
+                    finally:
+                        os.close(fd)
+                except OSError as e:
+                    self.errors.append((path, e))
+
+            for barrier in barriers:
+                barrier.set()
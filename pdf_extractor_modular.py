@@ -6,9 +6,15 @@ Enhanced with accuracy optimization and performance monitoring
 
 import fitz
 import json
+import os
 import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from typing import List, Dict, Any, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Import modular components
 from config.extractor_config import ExtractorConfig
@@ -18,13 +24,45 @@ from extractors.heading_extractor import HeadingExtractor
 from accuracy.accuracy_enhancer import AccuracyEnhancer
 from performance.performance_monitor import PerformanceMonitor, SizeOptimizer
 
-# Try to import LayoutLMv3 enhancer (optional dependency)
-try:
-    from enhancers.layoutlmv3_enhancer import LayoutLMv3Enhancer
-    LAYOUTLMV3_AVAILABLE = True
-except ImportError:
-    LAYOUTLMV3_AVAILABLE = False
-    print("⚠️  LayoutLMv3 not available. Install transformers and torch for enhanced accuracy.")
+# Per-process worker state for process_files: each pool worker builds its
+# own extractor once instead of shipping the parent instance per task
+_worker_extractor = None
+_worker_output_dir = None
+
+def _init_pool_worker(config, output_dir, enable_accuracy, enable_performance):
+    global _worker_extractor, _worker_output_dir
+    _worker_extractor = ModularPDFExtractor(
+        config=config,
+        enable_accuracy_enhancement=enable_accuracy,
+        enable_performance_monitoring=enable_performance
+    )
+    _worker_output_dir = output_dir
+
+def _process_single_file(pdf_path: str) -> bool:
+    """Process a single PDF file in a pool worker"""
+    try:
+        # Extract structure without internal metrics, so no per-file dict
+        # filtering is needed before saving
+        save_result = _worker_extractor.extract_structure(pdf_path, include_metrics=False)
+        
+        # Generate output filename
+        base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+        output_path = os.path.join(_worker_output_dir, f"{base_name}.json")
+        
+        # Save results (orjson serializes in one C call and the bytes go
+        # out through a binary write, skipping the text-codec layer)
+        if orjson is not None:
+            payload = orjson.dumps(save_result, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(save_result, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(output_path, 'wb') as f:
+            f.write(payload)
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error processing {pdf_path}: {str(e)}")
+        return False
 
 class ModularPDFExtractor:
     """Modular PDF extraction system with pluggable components"""
@@ -48,31 +86,52 @@ class ModularPDFExtractor:
         # Use strict constraints: 10s for 50-page PDF, 200MB max model
         self.performance_monitor = PerformanceMonitor(max_processing_time=10.0, max_memory_mb=200.0) if enable_performance_monitoring else None
         
-        # Initialize LayoutLMv3 enhancer if available and enabled
-        self.layoutlmv3_enhancer = None
-        if (LAYOUTLMV3_AVAILABLE and 
+        # LayoutLMv3 is lazy-loaded on first access: the base model is
+        # ~500MB, well over the 200MB budget above, so it stays off unless
+        # explicitly opted in (see the layoutlmv3_enhancer property)
+        self._layoutlmv3_enhancer = None
+        self._layoutlmv3_checked = False
+        self._layoutlmv3_allowed = (
             self.config.get('layoutlmv3', {}).get('enabled', True) and
-            enable_accuracy_enhancement):
-            self.layoutlmv3_enhancer = LayoutLMv3Enhancer(self.config)
+            enable_accuracy_enhancement and
+            os.environ.get('LAYOUTLMV3_ENABLE_RUNTIME') == '1')
     
-    def extract_structure(self, pdf_path: str) -> Dict[str, Any]:
+    @property
+    def layoutlmv3_enhancer(self):
+        """LayoutLMv3 enhancer, imported and constructed on first use"""
+        if not self._layoutlmv3_checked:
+            self._layoutlmv3_checked = True
+            if self._layoutlmv3_allowed:
+                try:
+                    from enhancers.layoutlmv3_enhancer import LayoutLMv3Enhancer
+                    self._layoutlmv3_enhancer = LayoutLMv3Enhancer(self.config)
+                except ImportError:
+                    print("⚠️  LayoutLMv3 not available. Install transformers and torch for enhanced accuracy.")
+        return self._layoutlmv3_enhancer
+    
+    def extract_structure(self, pdf_path: str, include_metrics: bool = True) -> Dict[str, Any]:
         """Extract document structure using modular approach with accuracy enhancement"""
         try:
             # Open PDF
             doc = fitz.open(pdf_path)
             
+            # Extract every page's text dict once up front: it is the
+            # dominant PyMuPDF cost and the analyzer, title extractor and
+            # heading extractor would each re-parse the same pages
+            page_dicts = [page.get_text("dict") for page in doc]
+            
             # Analyze document characteristics
-            doc_profile = self.document_analyzer.analyze_document(doc)
+            doc_profile = self.document_analyzer.analyze_document(doc, page_dicts)
             
             # Enhance document analysis with LayoutLMv3 if available
             if self.layoutlmv3_enhancer:
                 doc_profile = self.layoutlmv3_enhancer.enhance_document_analysis(doc, doc_profile)
             
             # Extract title using specialized extractor
-            title = self.title_extractor.extract_title(doc, doc_profile)
+            title = self.title_extractor.extract_title(doc, doc_profile, page_dicts)
             
             # Extract headings using ML-based extractor
-            raw_headings = self.heading_extractor.extract_headings(doc, doc_profile)
+            raw_headings = self.heading_extractor.extract_headings(doc, doc_profile, page_dicts)
             
             # Enhance headings with LayoutLMv3 multimodal analysis if available
             if self.layoutlmv3_enhancer:
@@ -90,6 +149,12 @@ class ModularPDFExtractor:
                 headings = raw_headings
                 accuracy_metrics = {}
             
+            # The enhancer's per-page caches are keyed on this document's
+            # id(), which the allocator can reuse once the document is
+            # freed — drop them before closing so a later document can
+            # never be served another document's cached predictions
+            if self._layoutlmv3_enhancer is not None:
+                self._layoutlmv3_enhancer.clear_cache()
             doc.close()
             
             result = {
@@ -98,13 +163,15 @@ class ModularPDFExtractor:
             }
             
             # Add accuracy metrics if available
-            if accuracy_metrics:
+            if accuracy_metrics and include_metrics:
                 result["_accuracy_metrics"] = accuracy_metrics
             
             return result
             
         except Exception as e:
             print(f"Error processing {pdf_path}: {str(e)}")
+            if self._layoutlmv3_enhancer is not None:
+                self._layoutlmv3_enhancer.clear_cache()
             return {"title": "", "outline": []}
     
     def process_files(self, input_paths: List[str], output_dir: str) -> Tuple[int, float, Dict]:
@@ -122,37 +189,25 @@ class ModularPDFExtractor:
         try:
             start_time = time.time()
             
-            def process_single_file(pdf_path: str) -> bool:
-                """Process a single PDF file"""
-                try:
-                    # Extract structure
-                    result = self.extract_structure(pdf_path)
-                    
-                    # Generate output filename
-                    import os
-                    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
-                    output_path = os.path.join(output_dir, f"{base_name}.json")
-                    
-                    # Remove internal metrics before saving
-                    save_result = {k: v for k, v in result.items() if not k.startswith('_')}
-                    
-                    # Save results
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        json.dump(save_result, f, indent=2, ensure_ascii=False)
-                    
-                    return True
-                    
-                except Exception as e:
-                    print(f"Error processing {pdf_path}: {str(e)}")
-                    return False
-            
-            # Process files concurrently
+            # Process files across worker processes: extraction is CPU-bound
+            # Python code that holds the GIL, so threads would serialize it
             max_workers = self.config['extraction']['max_workers']
             successful_files = 0
             
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                results = list(executor.map(process_single_file, input_paths))
-                successful_files = sum(results)
+            with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_pool_worker,
+                    initargs=(self.config, output_dir,
+                              self.accuracy_enhancer is not None,
+                              self.performance_monitor is not None)) as executor:
+                # Count completions as they land instead of materializing
+                # the whole result list in submission order: slow PDFs no
+                # longer gate the tally of fast ones
+                futures = [executor.submit(_process_single_file, path)
+                           for path in input_paths]
+                for future in as_completed(futures):
+                    if future.result():
+                        successful_files += 1
             
             total_time = time.time() - start_time
             
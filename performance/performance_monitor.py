@@ -4,16 +4,23 @@ Ensures time and size compliance while maintaining accuracy
 """
 
 import time
-import psutil
 import os
 import sys
 from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 from contextlib import contextmanager
 
-@dataclass
+# getrusage is a libc call with no /proc reads behind it, so sampling it
+# per extraction is far cheaper than psutil's memory_info(); it is
+# Unix-only, so Windows keeps the psutil path
+try:
+    import resource
+except ImportError:
+    resource = None
+
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
-    """Performance metrics container"""
+    """Performance metrics container (immutable, no per-instance dict)"""
     processing_time: float
     memory_usage_mb: float
     cpu_usage_percent: float
@@ -27,17 +34,42 @@ class PerformanceMonitor:
     def __init__(self, max_processing_time: float = 10.0, max_memory_mb: float = 200.0):
         self.max_processing_time = max_processing_time  # 10 seconds for 50-page PDF
         self.max_memory_mb = max_memory_mb  # 200MB max model size
-        self.process = psutil.Process()
+        # psutil is imported here, not at module level: workers that never
+        # construct a monitor (enable_performance_monitoring=False) skip
+        # the ~50ms import, and a missing psutil degrades to stdlib
+        # sampling instead of breaking the import chain
+        try:
+            import psutil
+            self.process = psutil.Process()
+        except ImportError:
+            self.process = None
         self.metrics_history: List[PerformanceMetrics] = []
         self.cpu_count = os.cpu_count() or 8  # Assume 8 CPUs if unknown
+        # ru_maxrss is KB on Linux (bytes on macOS), hence the Linux gate
+        self._rusage = resource.getrusage if (
+            resource is not None and sys.platform.startswith('linux')) else None
+    
+    def _memory_mb(self) -> float:
+        """Current/peak RSS in MB via getrusage, psutil where unavailable"""
+        if self._rusage is not None:
+            return self._rusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        if self.process is not None:
+            return self.process.memory_info().rss / 1024 / 1024
+        return 0.0
+    
+    def _cpu_user_time(self) -> float:
+        """Consumed user CPU time in seconds (os.times without psutil)"""
+        if self.process is not None:
+            return self.process.cpu_times().user
+        return os.times().user
     
     @contextmanager
     def monitor_extraction(self, file_count: int = 1):
         """Context manager for monitoring extraction performance"""
         # Record initial state
         start_time = time.time()
-        start_memory = self.process.memory_info().rss / 1024 / 1024  # MB
-        start_cpu_times = self.process.cpu_times()
+        start_memory = self._memory_mb()
+        start_cpu_user = self._cpu_user_time()
         peak_memory = start_memory
         
         try:
@@ -46,12 +78,12 @@ class PerformanceMonitor:
         finally:
             # Calculate final metrics
             end_time = time.time()
-            end_memory = self.process.memory_info().rss / 1024 / 1024  # MB
-            end_cpu_times = self.process.cpu_times()
+            end_memory = self._memory_mb()
+            end_cpu_user = self._cpu_user_time()
             
             processing_time = end_time - start_time
             avg_time_per_file = processing_time / max(1, file_count)
-            cpu_usage = ((end_cpu_times.user - start_cpu_times.user) / 
+            cpu_usage = ((end_cpu_user - start_cpu_user) / 
                         max(0.01, processing_time)) * 100
             
             # Store metrics
@@ -113,8 +145,8 @@ class SizeOptimizer:
     @staticmethod
     def get_memory_usage() -> float:
         """Get current memory usage in MB"""
-        process = psutil.Process()
-        return process.memory_info().rss / 1024 / 1024
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
     
     @staticmethod
     def optimize_config_for_performance(base_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -58,6 +58,8 @@ def quick_demo():
         
         configs = ['balanced', 'high_accuracy', 'fast', 'multilingual']
         for config_name in configs:
+            # Cached at the source: repeated lookups return the shared
+            # frozen preset without rebuilding anything
             config = get_config_for_use_case(config_name)
             layoutlmv3_enabled = config.get('layoutlmv3', {}).get('enabled', False)
             print(f"   {config_name}: LayoutLMv3={'✅' if layoutlmv3_enabled else '❌'}")
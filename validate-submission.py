@@ -4,10 +4,72 @@ Submission Checklist Validator
 Validates all required submission components are present and correct
 """
 
+import hashlib
+import io
 import os
 import json
+import re
+from contextlib import redirect_stdout
 from pathlib import Path
 
+# Every README needle in one case-insensitive byte-level pattern: the
+# zero-width lookahead makes overlapping needles (e.g. 'amd64' inside
+# 'linux/amd64') all report, matching the semantics of the previous
+# per-needle substring probes in a single pass without the full-buffer
+# lower() copy
+_README_NEEDLES = (
+    b'approach', b'architecture', b'design', b'strategy',
+    b'models and libraries', b'libraries used', b'dependencies', b'core libraries',
+    b'how to build', b'building', b'docker build', b'build the solution',
+    b'how to run', b'running', b'docker run', b'run the solution',
+    b'amd64', b'linux/amd64',
+    b'10s', b'200mb', b'performance',
+    '≤10'.encode(), '≤200'.encode(),
+    b'--network none', b'offline',
+)
+_README_RE = re.compile(
+    b'(?i)(?=(' + b'|'.join(map(re.escape, _README_NEEDLES)) + b'))')
+
+def _readme_hits(data):
+    """Set of lowercased README needles present in the raw bytes"""
+    return {match.group(1).lower() for match in _README_RE.finditer(data)}
+
+_CACHE_DIR = Path(".validate_cache")
+
+def _cached_check(path, checker):
+    """Replay a checker's cached report while its file is unchanged
+
+    The cache key is (path, mtime_ns, size), so any touch of the file
+    invalidates the entry; both the boolean result and the printed report
+    are stored, making a cache hit indistinguishable from a fresh run.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return checker()
+    key = hashlib.blake2b(
+        f"{checker.__name__}:{path}:{st.st_mtime_ns}:{st.st_size}".encode(),
+        digest_size=16).hexdigest()
+    cache_file = _CACHE_DIR / f"{key}.json"
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        print(cached["report"], end="")
+        return cached["result"]
+    except (OSError, ValueError, KeyError):
+        pass
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = checker()
+    report = buffer.getvalue()
+    print(report, end="")
+    try:
+        _CACHE_DIR.mkdir(exist_ok=True)
+        cache_file.write_text(
+            json.dumps({"result": result, "report": report}), encoding="utf-8")
+    except OSError:
+        pass
+    return result
+
 def validate_git_repository():
     """Check if this is a valid git repository"""
     git_dir = Path(".git")
@@ -20,12 +82,11 @@ def validate_git_repository():
 
 def validate_dockerfile():
     """Check if Dockerfile exists and is properly configured"""
-    dockerfile = Path("Dockerfile")
-    if not dockerfile.exists():
+    try:
+        content = Path("Dockerfile").read_text(encoding='utf-8')
+    except FileNotFoundError:
         print("❌ Dockerfile not found in root directory")
         return False
-    
-    content = dockerfile.read_text(encoding='utf-8')
     checks = {
         "AMD64 platform": "--platform=linux/amd64" in content,
         "Python base image": "python:" in content,
@@ -53,17 +114,18 @@ def validate_dockerfile():
 
 def validate_dependencies():
     """Check if requirements.txt exists and contains necessary dependencies"""
-    req_file = Path("requirements.txt")
-    if not req_file.exists():
+    # Lowercase the file once: the loops below used to re-lower the whole
+    # buffer on every membership test
+    try:
+        content_lower = Path("requirements.txt").read_text(encoding='utf-8').lower()
+    except FileNotFoundError:
         print("❌ requirements.txt not found")
         return False
-    
-    content = req_file.read_text(encoding='utf-8')
     required_deps = ["PyMuPDF", "scikit-learn", "numpy"]
     
     all_found = True
     for dep in required_deps:
-        if dep.lower() in content.lower():
+        if dep.lower() in content_lower:
             print(f"  ✅ {dep} found in requirements")
         else:
             print(f"  ❌ {dep} missing from requirements")
@@ -71,9 +133,10 @@ def validate_dependencies():
     
     # Check for GPU dependencies (should not be present)
     gpu_deps = ["torch", "tensorflow", "cuda"]
+    cpu_pinned = "cpu" in content_lower
     gpu_found = False
     for dep in gpu_deps:
-        if dep in content.lower() and "cpu" not in content.lower():
+        if dep in content_lower and not cpu_pinned:
             print(f"  ⚠️  GPU dependency {dep} found - ensure CPU-only")
             gpu_found = True
     
@@ -89,23 +152,22 @@ def validate_dependencies():
 
 def validate_readme():
     """Check if README.md exists and contains required sections"""
-    readme = Path("README.md")
-    if not readme.exists():
+    try:
+        hits = _readme_hits(Path("README.md").read_bytes())
+    except FileNotFoundError:
         print("❌ README.md not found")
         return False
     
-    content = readme.read_text(encoding='utf-8').lower()
-    
     required_sections = {
-        "approach": ["approach", "architecture", "design", "strategy"],
-        "models/libraries": ["models and libraries", "libraries used", "dependencies", "core libraries"],
-        "build instructions": ["how to build", "building", "docker build", "build the solution"],
-        "run instructions": ["how to run", "running", "docker run", "run the solution"]
+        "approach": [b"approach", b"architecture", b"design", b"strategy"],
+        "models/libraries": [b"models and libraries", b"libraries used", b"dependencies", b"core libraries"],
+        "build instructions": [b"how to build", b"building", b"docker build", b"build the solution"],
+        "run instructions": [b"how to run", b"running", b"docker run", b"run the solution"]
     }
     
     all_found = True
     for section, keywords in required_sections.items():
-        found = any(keyword in content for keyword in keywords)
+        found = any(keyword in hits for keyword in keywords)
         icon = "✅" if found else "❌"
         print(f"  {icon} {section.title()} section")
         if not found:
@@ -113,10 +175,11 @@ def validate_readme():
     
     # Check for specific required content
     specific_checks = {
-        "Docker commands": "docker build" in content and "docker run" in content,
-        "AMD64 platform": "amd64" in content or "linux/amd64" in content,
-        "Performance specs": any(x in content for x in ["10s", "200mb", "performance", "≤10", "≤200"]),
-        "Network isolation": "--network none" in content or "offline" in content
+        "Docker commands": b"docker build" in hits and b"docker run" in hits,
+        "AMD64 platform": b"amd64" in hits or b"linux/amd64" in hits,
+        "Performance specs": bool(hits & {b"10s", b"200mb", b"performance",
+                                          "≤10".encode(), "≤200".encode()}),
+        "Network isolation": b"--network none" in hits or b"offline" in hits
     }
     
     for check, passed in specific_checks.items():
@@ -146,10 +209,12 @@ def validate_docker_commands():
     """Validate the Docker commands match submission requirements"""
     print("🐳 Validating Docker commands...")
     
-    # Check build scripts
-    build_script = Path("docker-build-amd64.sh")
-    if build_script.exists():
-        content = build_script.read_text(encoding='utf-8')
+    # Check build scripts (missing files are skipped, as before)
+    try:
+        content = Path("docker-build-amd64.sh").read_text(encoding='utf-8')
+    except FileNotFoundError:
+        content = None
+    if content is not None:
         if "mysolutionname:somerandomidentifier" in content:
             print("  ✅ Build script uses correct image name")
         else:
@@ -157,9 +222,11 @@ def validate_docker_commands():
             return False
     
     # Check deployment scripts
-    deploy_script = Path("deploy.sh")
-    if deploy_script.exists():
-        content = deploy_script.read_text(encoding='utf-8')
+    try:
+        content = Path("deploy.sh").read_text(encoding='utf-8')
+    except FileNotFoundError:
+        content = None
+    if content is not None:
         if "mysolutionname:somerandomidentifier" in content and "--network none" in content:
             print("  ✅ Deploy script uses correct run command")
         else:
@@ -176,8 +243,9 @@ def main():
     checklist_items = [
         ("1. Git Repository", validate_git_repository),
         ("2. Working Dockerfile", validate_dockerfile),
-        ("3. Dependencies", validate_dependencies),  
-        ("4. README.md", validate_readme),
+        ("3. Dependencies",
+         lambda: _cached_check("requirements.txt", validate_dependencies)),
+        ("4. README.md", lambda: _cached_check("README.md", validate_readme)),
         ("5. Main Script", validate_main_script),
         ("6. Docker Commands", validate_docker_commands)
     ]